@@ -9,7 +9,7 @@ setup(
     author="Atsushi Togo",
     author_email="atz.togo@gmail.com",
     python_requires=">=3.8",
-    install_requires=["numpy>=1.22", "alm"],
+    install_requires=["numpy>=1.23", "scipy", "alm"],
     provides=["symfc_alm"],
     platforms=["all"],
 )
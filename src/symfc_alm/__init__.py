@@ -2,5 +2,6 @@
 from .symfc_alm import CellDataset  # noqa: F401
 from .symfc_alm import DispForceDataset  # noqa: F401
 from .symfc_alm import LinearModel  # noqa: F401
+from .symfc_alm import LinearSolver  # noqa: F401
 from .symfc_alm import SymfcAlm  # noqa: F401
 from .symfc_alm import read_dataset  # noqa: F401
@@ -0,0 +1,189 @@
+"""Least squares solvers for linear regression."""
+
+from typing import Optional
+
+import numpy as np
+import scipy.linalg
+
+
+def solve_lstsq(A: np.ndarray, b: np.ndarray, overwrite: bool = False) -> np.ndarray:
+    """Solve linear least squares problem using LAPACK gelsd.
+
+    The minimum norm solution is returned when A is rank deficient. Singular
+    values smaller than max(A.shape) * eps * (largest singular value) are
+    treated as zero. Without this cutoff, gelsd keeps singular values down to
+    eps * (largest singular value), which amplifies numerical noise of rank
+    deficient A.
+
+    Parameters
+    ----------
+    A : ndarray
+        Matrix A, derived from displacements.
+        shape=(3 * num_atoms * ndata, num_fc)
+    b : ndarray
+        Vector b, derived from atomic forces.
+        shape=(3 * num_atoms * ndata,)
+    overwrite : bool, optional
+        When set to ``True``, A and b may be overwritten to avoid copying
+        them. A is used in-place by LAPACK only when it is Fortran-ordered.
+
+    Returns
+    -------
+    psi : ndarray
+        The irreducible set of force constants.
+        shape=(num_fc,)
+
+    """
+    cond = max(A.shape) * np.finfo(A.dtype).eps
+    psi, *_ = scipy.linalg.lstsq(
+        A,
+        b,
+        cond=cond,
+        lapack_driver="gelsd",
+        overwrite_a=overwrite,
+        overwrite_b=overwrite,
+        check_finite=False,
+    )
+    return psi
+
+
+def solve_normal(A: np.ndarray, b: np.ndarray, overwrite: bool = False) -> np.ndarray:
+    r"""Solve normal equations using Cholesky decomposition.
+
+    The normal equations
+
+    A^{T}A \psi = A^{T}b
+
+    are solved by computing A^{T}A with BLAS syrk and then its Cholesky
+    decomposition with LAPACK potrf. Rank deficiency of A does not necessarily
+    break the Cholesky decomposition down numerically, so the reciprocal
+    condition number of A^{T}A is estimated with LAPACK pocon. When the
+    decomposition fails or the reciprocal condition number is smaller than
+    sqrt(eps), i.e., A is (nearly) rank deficient, this falls back to
+    solve_lstsq().
+
+    Parameters
+    ----------
+    See docstring of solve_lstsq().
+
+    Returns
+    -------
+    See docstring of solve_lstsq().
+
+    """
+    (syrk,) = scipy.linalg.get_blas_funcs(("syrk",), (A,))
+    potrf, pocon, potrs = scipy.linalg.get_lapack_funcs(
+        ("potrf", "pocon", "potrs"), (A,)
+    )
+    # syrk works on a Fortran-ordered matrix without copying, and A.T of
+    # a C-contiguous A is Fortran-ordered.
+    if A.flags.f_contiguous:
+        G = syrk(1.0, A, trans=1)
+    else:
+        G = syrk(1.0, A.T, trans=0)
+    # 1-norm of symmetric A^T A from its upper triangle, required by pocon.
+    abs_G = np.abs(np.triu(G))
+    anorm = (abs_G.sum(axis=0) + abs_G.sum(axis=1) - abs_G.diagonal()).max()
+    cho, info = potrf(G, lower=0, overwrite_a=True)
+    if info == 0:
+        rcond, info = pocon(cho, anorm)
+    if info != 0 or rcond < np.sqrt(np.finfo(A.dtype).eps):
+        return solve_lstsq(A, b, overwrite=overwrite)
+    psi, _ = potrs(cho, A.T @ b, lower=0, overwrite_b=True)
+    return psi
+
+
+def solve_normal_mixed(
+    A: np.ndarray,
+    b: np.ndarray,
+    overwrite: bool = False,
+    tol: Optional[float] = None,
+    max_iter: int = 15,
+) -> np.ndarray:
+    r"""Solve normal equations using single precision Cholesky decomposition.
+
+    A^{T}A is computed and Cholesky decomposed in single precision, which
+    halves the cost of the dominant syrk step. The solution is then improved by
+    iterative refinement, where the residuals of the normal equations
+
+    r = A^{T}b - A^{T}A \psi
+
+    are computed in double precision, until
+
+    \lVert r\rVert_{2} < tol \lVert A^{T}b\rVert_{2}
+
+    is satisfied. Refinement converges only when A is well-conditioned, roughly
+    cond(A) < 1e3. When the single precision Cholesky decomposition fails, or
+    the refinement stagnates or does not converge within max_iter steps, this
+    falls back to solve_normal() in double precision. In that case, the single
+    precision steps are wasted and this is slower than solve_normal().
+
+    Parameters
+    ----------
+    See docstring of solve_lstsq().
+    tol : float, optional
+        Tolerance of the relative residual of the normal equations. Default
+        (None) gives max(A.shape) * eps of double precision.
+    max_iter : int, optional
+        Maximum number of refinement steps.
+
+    Returns
+    -------
+    See docstring of solve_lstsq().
+
+    """
+    if tol is None:
+        tol = max(A.shape) * np.finfo("double").eps
+    (syrk,) = scipy.linalg.get_blas_funcs(("syrk",), dtype="float32")
+    potrf, potrs = scipy.linalg.get_lapack_funcs(("potrf", "potrs"), dtype="float32")
+    # astype keeps memory order, see solve_normal() for the choice of trans.
+    if A.flags.f_contiguous:
+        G = syrk(1.0, A.astype("float32"), trans=1)
+    else:
+        G = syrk(1.0, A.T.astype("float32"), trans=0)
+    cho, info = potrf(G, lower=0, overwrite_a=True)
+    if info != 0:
+        return solve_normal(A, b, overwrite=overwrite)
+    c = A.T @ b
+    c_norm = np.linalg.norm(c)
+    psi = np.zeros(A.shape[1], dtype="double")
+    r, r_norm = c, c_norm
+    for _ in range(max_iter):
+        psi += potrs(cho, r.astype("float32"), lower=0)[0]
+        r = c - A.T @ (A @ psi)
+        r_norm, r_norm_prev = np.linalg.norm(r), r_norm
+        if r_norm <= tol * c_norm:
+            return psi
+        if r_norm > 0.5 * r_norm_prev:
+            break
+    return solve_normal(A, b, overwrite=overwrite)
+
+
+def solve_pinv(A: np.ndarray, b: np.ndarray, rcond: float = 1e-15) -> np.ndarray:
+    r"""Solve linear least squares problem using pseudoinverse of A.
+
+    With the thin singular value decomposition A = U \Sigma V^{T},
+
+    \psi = V \Sigma^{+} U^{T}b
+
+    is computed without forming the pseudoinverse matrix.
+
+    Parameters
+    ----------
+    See docstring of solve_lstsq().
+    rcond : float, optional
+        Singular values smaller than rcond * (largest singular value) are
+        treated as zero.
+
+    Returns
+    -------
+    See docstring of solve_lstsq().
+
+    """
+    U, sigma, Vt = scipy.linalg.svd(
+        A, full_matrices=False, check_finite=False, lapack_driver="gesdd"
+    )
+    sigma_inv = np.zeros_like(sigma)
+    nonzero = sigma > rcond * sigma[0]
+    sigma_inv[nonzero] = 1 / sigma[nonzero]
+    return Vt.T @ (sigma_inv * (U.T @ b))
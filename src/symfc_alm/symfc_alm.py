@@ -5,6 +5,9 @@ import io
 import lzma
 import os
 import pathlib
+import shutil
+import subprocess
+import warnings
 from dataclasses import dataclass
 from enum import Enum
 from typing import Optional, Union
@@ -13,6 +16,12 @@ import numpy as np
 import numpy.typing as npt
 from alm import ALM
 
+from symfc_alm.least_squares import (
+    solve_lstsq,
+    solve_normal,
+    solve_normal_mixed,
+    solve_pinv,
+)
 from symfc_alm.ridge import ridge_regression
 
 
@@ -35,41 +44,145 @@ class LinearModel(Enum):
     RidgeRegression = 2
 
 
-def read_dataset(fp: Union[str, bytes, os.PathLike, io.IOBase]):
+class LinearSolver(Enum):
+    """Solver of least squares problem used with LinearModel.LinearRegression."""
+
+    LeastSquares = 1
+    Cholesky = 2
+    PseudoInverse = 3
+    CholeskyMixedPrecision = 4
+
+
+def read_dataset(
+    fp: Union[str, bytes, os.PathLike, io.IOBase], natom: Optional[int] = None
+):
     """Read displacements-forces dataset.
 
     Parameters
-     ----------
-     fp : filename or stream
-         filename or stream.
+    ----------
+    fp : filename or stream
+        filename or stream.
+    natom : int
+        Number of atoms in supercell. Default (None) gives 64 with
+        DeprecationWarning.
 
     """
+    if natom is None:
+        warnings.warn(
+            "natom of read_dataset() will be required. natom=64 is used.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        natom = 64
     if isinstance(fp, io.IOBase):
-        data = np.loadtxt(fp).reshape(-1, 64, 6)
+        content = fp.read()
     else:
         ext = pathlib.Path(fp).suffix
         if ext == ".xz":
-            _io = lzma
+            content = _read_xz(fp)
         else:
-            _io = io
-        with _io.open(fp, "rb") as f:
-            data = np.loadtxt(f).reshape(-1, 64, 6)
-    displacements = data[:, :, :3]
-    forces = data[:, :, 3:]
-    return DispForceDataset(displacements, forces)
+            with io.open(fp, "rb") as f:
+                content = f.read()
+    # Parsing the whole content at once is faster than letting np.loadtxt read
+    # the (decompressing) stream line by line.
+    if isinstance(content, str):
+        buf = io.StringIO(content)
+    else:
+        buf = io.BytesIO(content)
+    data = np.loadtxt(buf, dtype="double")
+    if data.size % (natom * 6) != 0:
+        raise RuntimeError(f"Dataset is inconsistent with natom={natom}.")
+    data = data.reshape(-1, natom, 6)
+    return DispForceDataset(data=data)
+
+
+def _read_xz(fp: Union[str, bytes, os.PathLike]) -> bytes:
+    """Return decompressed content of xz file.
+
+    xz command decompresses multi-block xz files using multiple threads (XZ Utils
+    >= 5.4), which python lzma module can not. lzma module is used when xz
+    command is unavailable or fails.
+
+    """
+    xz = shutil.which("xz")
+    if xz is not None:
+        proc = subprocess.run(
+            [xz, "-T0", "-dc", "--", os.fsdecode(fp)],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        if proc.returncode == 0:
+            return proc.stdout
+    with lzma.open(fp, "rb") as f:
+        return f.read()
 
 
 @dataclass
 class DispForceDataset:
-    """Displacements-forces dataset."""
+    """Displacements-forces dataset.
+
+    Displacements and forces given at initialization are stored in one array of
+    shape=(ndata, num_atoms, 6), and displacements and forces are views of it.
+    They are plain attributes and can be reassigned independently, e.g., to
+    select configurations. Consistency of their shapes is checked when they are
+    passed to ALM.
+
+    displacements : ndarray
+        Atomic displacements.
+        shape=(ndata, num_atoms, 3), dtype='double'
+    forces : ndarray
+        Atomic forces.
+        shape=(ndata, num_atoms, 3), dtype='double'
+
+    """
 
     displacements: np.ndarray
     forces: np.ndarray
 
-    def __init__(self, displacements: npt.ArrayLike, forces: npt.ArrayLike):
-        """Init method."""
-        self.displacements = np.array(displacements, dtype="double", order="C")
-        self.forces = np.array(forces, dtype="double", order="C")
+    def __init__(
+        self,
+        displacements: Optional[npt.ArrayLike] = None,
+        forces: Optional[npt.ArrayLike] = None,
+        data: Optional[npt.ArrayLike] = None,
+    ):
+        """Init method.
+
+        Either displacements and forces, or data has to be given.
+
+        Parameters
+        ----------
+        displacements : array_like
+            Atomic displacements. shape=(ndata, num_atoms, 3)
+        forces : array_like
+            Atomic forces. shape=(ndata, num_atoms, 3)
+        data : array_like
+            Displacements and forces concatenated along the last axis. This is
+            not copied when it is already a C-contiguous double array.
+            shape=(ndata, num_atoms, 6)
+
+        """
+        if data is not None:
+            if displacements is not None or forces is not None:
+                raise RuntimeError(
+                    "Displacements and forces can not be given with data."
+                )
+            data = np.ascontiguousarray(data, dtype="double")
+            if data.shape[-1] != 6:
+                raise TypeError("Shape of last dimension of data has to be 6.")
+        elif displacements is not None and forces is not None:
+            displacements = np.asarray(displacements, dtype="double")
+            forces = np.asarray(forces, dtype="double")
+            if displacements.shape != forces.shape:
+                raise RuntimeError(
+                    "Shapes of displacements and forces are inconsistent."
+                )
+            if displacements.shape[-1] != 3:
+                raise TypeError("Shape of last dimension of displacements has to be 3.")
+            data = np.concatenate((displacements, forces), axis=-1)
+        else:
+            raise RuntimeError("Displacements and forces, or data is required.")
+        self.displacements = data[..., :3]
+        self.forces = data[..., 3:]
 
 
 @dataclass
@@ -96,9 +209,9 @@ class CellDataset:
         self, lattice: npt.ArrayLike, points: npt.ArrayLike, numbers: npt.ArrayLike
     ):
         """Init method."""
-        self.lattice = np.array(lattice, dtype="double", order="C")
-        self.points = np.array(points, dtype="double", order="C")
-        self.numbers = np.array(numbers, dtype="intc")
+        self.lattice = np.ascontiguousarray(lattice, dtype="double")
+        self.points = np.ascontiguousarray(points, dtype="double")
+        self.numbers = np.ascontiguousarray(numbers, dtype="intc")
         if len(self.numbers) != len(self.points):
             raise RuntimeError("Shapes of numbers and points are inconsistent.")
         if self.points.shape[1] != 3:
@@ -134,8 +247,19 @@ class SymfcAlm:
         self._alm: Optional[ALM] = None
 
     @property
-    def force_constants(self) -> list[np.ndarray]:
-        """Return force constants."""
+    def force_constants(self) -> list:
+        """Return force constants.
+
+        With SymfcAlm.run(dense=True), list of ndarray of (order+1)-th order force
+        constants, shape=(num_atoms,) * (order + 1) + (3,) * (order + 1).
+
+        With SymfcAlm.run(dense=False), list of tuple (values, indices) of
+        (order+1)-th order force constants. values (shape=(num_elems,)) are the
+        elements given by ALM, and indices (shape=(num_elems, 2 * (order + 1)))
+        are their indices in the dense array above, i.e.,
+        ``fc[tuple(indices.T)] = values``.
+
+        """
         return self._force_constants
 
     def __enter__(self):
@@ -176,6 +300,8 @@ class SymfcAlm:
         auto: bool = True,
         nbody: Optional[npt.ArrayLike] = None,
         linear_model: LinearModel = LinearModel.LinearRegression,
+        solver: LinearSolver = LinearSolver.LeastSquares,
+        dense: bool = True,
     ):
         """Compute force constants.
 
@@ -193,14 +319,33 @@ class SymfcAlm:
             - nbody=[0, 3] : only 3rd order force constants
             are computed. Default (None) gives
             ``[i + 2 for i in range(maxorder)]`` like the first example.
+        linear_model : LinearModel
+            Linear model used for fitting force constants.
+        solver : LinearSolver
+            Solver of least squares problem. Use only LinearRegression.
+        dense : bool
+            When set to ``False``, force constants are stored as pairs of
+            elements and their indices instead of dense arrays, whose size grows
+            as (3 * num_atoms)^(order + 1). See SymfcAlm.force_constants.
 
         """
         if self._alm is None:
             raise ALMNotInstanciatedError("ALM is not instanciated.")
-        self.prepare(maxorder=maxorder, nbody=nbody)
-        A, b = self._alm.get_matrix_elements()
-        self.fit(A, b, alpha=alpha, auto=auto, linear_model=linear_model)
-        self._force_constants = self._extract_fc_from_alm(self._alm, maxorder)
+        A, b = self.get_matrix_elements(maxorder=maxorder, nbody=nbody)
+        self.fit(
+            A,
+            b,
+            alpha=alpha,
+            auto=auto,
+            linear_model=linear_model,
+            solver=solver,
+            overwrite=True,
+        )
+        # Release A and b before force constants arrays are allocated.
+        del A, b
+        self._force_constants = self._extract_fc_from_alm(
+            self._alm, maxorder, dense=dense
+        )
 
     def prepare(self, maxorder: int = 2, nbody: Optional[npt.ArrayLike] = None):
         """Prepare force constants calculation setting.
@@ -212,10 +357,13 @@ class SymfcAlm:
         """
         if self._alm is None:
             raise ALMNotInstanciatedError("ALM is not instanciated.")
+        if np.shape(self._dataset.displacements) != np.shape(self._dataset.forces):
+            raise RuntimeError("Shapes of displacements and forces are inconsistent.")
         self._alm.define(maxorder, nbody=nbody)
         self._alm.set_constraint()
-        self._alm.displacements = self._dataset.displacements
-        self._alm.forces = self._dataset.forces
+        # ALM takes displacements and forces as separate C-contiguous arrays.
+        self._alm.displacements = np.ascontiguousarray(self._dataset.displacements)
+        self._alm.forces = np.ascontiguousarray(self._dataset.forces)
 
     def fit(
         self,
@@ -224,6 +372,8 @@ class SymfcAlm:
         alpha: float = 0.1,
         auto: bool = True,
         linear_model: LinearModel = LinearModel.LinearRegression,
+        solver: LinearSolver = LinearSolver.LeastSquares,
+        overwrite: bool = False,
     ):
         """Fit force cosntants using matrices A and b.
 
@@ -233,12 +383,44 @@ class SymfcAlm:
             psi = min_{psi} (A psi - b)^{2} + alpha(psi)^{2}
         auto: bool
             When set to ``True``, the optimal alpha is automatically determined.
+        solver: LinearSolver
+            LinearSolver.LeastSquares:
+                LAPACK least squares solver (gelsd).
+            LinearSolver.Cholesky:
+                Cholesky decomposition of normal equations. This is fastest
+                when A is well-conditioned. When the Cholesky decomposition
+                fails or the estimated condition number of A^T A shows that A
+                is (nearly) rank deficient, LinearSolver.LeastSquares is used
+                instead.
+            LinearSolver.PseudoInverse:
+                psi = A^+.b using pseudoinverse of A.
+            LinearSolver.CholeskyMixedPrecision:
+                Same as LinearSolver.Cholesky but A^T A is computed and
+                decomposed in single precision, followed by iterative
+                refinement in double precision until the relative residual
+                of the normal equations is below max(A.shape) * eps. This is
+                faster than LinearSolver.Cholesky for large well-conditioned
+                A (roughly cond(A) < 1e3). Otherwise the refinement does not
+                converge and LinearSolver.Cholesky is used after the single
+                precision steps, which is slower.
+        overwrite: bool
+            When set to ``True``, A and b may be overwritten by the least squares
+            solver to avoid copying them. Use only LinearRegression.
 
         """
         if self._alm is None:
             raise ALMNotInstanciatedError("ALM is not instanciated.")
         if linear_model is LinearModel.LinearRegression:
-            psi = np.linalg.pinv(A) @ b
+            if solver is LinearSolver.LeastSquares:
+                psi = solve_lstsq(A, b, overwrite=overwrite)
+            elif solver is LinearSolver.Cholesky:
+                psi = solve_normal(A, b, overwrite=overwrite)
+            elif solver is LinearSolver.CholeskyMixedPrecision:
+                psi = solve_normal_mixed(A, b, overwrite=overwrite)
+            elif solver is LinearSolver.PseudoInverse:
+                psi = solve_pinv(A, b)
+            else:
+                raise RuntimeError("Unsupported linear solver.")
         elif linear_model is LinearModel.RidgeRegression:
             psi = ridge_regression(A, b, alpha, auto)
         else:
@@ -264,29 +446,33 @@ class SymfcAlm:
         """
         if self._alm is None:
             raise ALMNotInstanciatedError("ALM is not instanciated.")
-        self._alm.define(maxorder, nbody=nbody)
-        self._alm.set_constraint()
-        self._alm.displacements = self._dataset.displacements
-        self._alm.forces = self._dataset.forces
+        self.prepare(maxorder=maxorder, nbody=nbody)
         A, b = self._alm.get_matrix_elements()
 
         return A, b
 
-    def _extract_fc_from_alm(self, alm: ALM, maxorder):
+    def _extract_fc_from_alm(self, alm: ALM, maxorder, dense: bool = True):
         natom = len(self._cell)
         fcs = []
         for order in range(1, maxorder + 1):
-            atom_list = np.arange(natom, dtype=int)
-            fc_shape = (len(atom_list),) + (natom,) * order + (3,) * (order + 1)
+            fc_elems, indices = alm.get_fc(order, mode="all")
+            indices = np.asarray(indices, dtype="int64").reshape(-1, order + 1)
+            # Indices of elements in fc, (atom indices, Cartesian indices),
+            # written by divmod directly into the two halves.
+            fc_indices = np.empty((len(indices), 2 * (order + 1)), dtype="int64")
+            np.divmod(
+                indices,
+                3,
+                out=(fc_indices[:, : order + 1], fc_indices[:, order + 1 :]),
+            )
+            if not dense:
+                fcs.append((np.asarray(fc_elems, dtype="double"), fc_indices))
+                continue
+
+            fc_shape = (natom,) * (order + 1) + (3,) * (order + 1)
             fc = np.zeros(fc_shape, dtype="double", order="C")
-            for fc_elem, indices in zip(*alm.get_fc(order, mode="all")):
-                v = indices // 3
-                idx = np.where(atom_list == v[0])[0]
-                if len(idx) > 0:
-                    c = indices % 3
-                    selection = (idx[0],) + tuple(v[1:]) + tuple(c)
-                    fc[selection] = fc_elem
-
+            strides = np.array(fc.strides, dtype="int64") // fc.itemsize
+            fc.reshape(-1)[fc_indices @ strides] = fc_elems
             fcs.append(fc)
 
         return fcs
@@ -35,72 +35,7 @@ def pytest_collection_modifyitems(config, items):
 @pytest.fixture(scope="session")
 def nacl_222_structure() -> CellDataset:
     """Return NaCl 2x2x2 supercell structure."""
-    points = [
-        [0.00, 0.00, 0.00],
-        [0.50, 0.00, 0.00],
-        [0.00, 0.50, 0.00],
-        [0.50, 0.50, 0.00],
-        [0.00, 0.00, 0.50],
-        [0.50, 0.00, 0.50],
-        [0.00, 0.50, 0.50],
-        [0.50, 0.50, 0.50],
-        [0.00, 0.25, 0.25],
-        [0.50, 0.25, 0.25],
-        [0.00, 0.75, 0.25],
-        [0.50, 0.75, 0.25],
-        [0.00, 0.25, 0.75],
-        [0.50, 0.25, 0.75],
-        [0.00, 0.75, 0.75],
-        [0.50, 0.75, 0.75],
-        [0.25, 0.00, 0.25],
-        [0.75, 0.00, 0.25],
-        [0.25, 0.50, 0.25],
-        [0.75, 0.50, 0.25],
-        [0.25, 0.00, 0.75],
-        [0.75, 0.00, 0.75],
-        [0.25, 0.50, 0.75],
-        [0.75, 0.50, 0.75],
-        [0.25, 0.25, 0.00],
-        [0.75, 0.25, 0.00],
-        [0.25, 0.75, 0.00],
-        [0.75, 0.75, 0.00],
-        [0.25, 0.25, 0.50],
-        [0.75, 0.25, 0.50],
-        [0.25, 0.75, 0.50],
-        [0.75, 0.75, 0.50],
-        [0.25, 0.25, 0.25],
-        [0.75, 0.25, 0.25],
-        [0.25, 0.75, 0.25],
-        [0.75, 0.75, 0.25],
-        [0.25, 0.25, 0.75],
-        [0.75, 0.25, 0.75],
-        [0.25, 0.75, 0.75],
-        [0.75, 0.75, 0.75],
-        [0.25, 0.00, 0.00],
-        [0.75, 0.00, 0.00],
-        [0.25, 0.50, 0.00],
-        [0.75, 0.50, 0.00],
-        [0.25, 0.00, 0.50],
-        [0.75, 0.00, 0.50],
-        [0.25, 0.50, 0.50],
-        [0.75, 0.50, 0.50],
-        [0.00, 0.25, 0.00],
-        [0.50, 0.25, 0.00],
-        [0.00, 0.75, 0.00],
-        [0.50, 0.75, 0.00],
-        [0.00, 0.25, 0.50],
-        [0.50, 0.25, 0.50],
-        [0.00, 0.75, 0.50],
-        [0.50, 0.75, 0.50],
-        [0.00, 0.00, 0.25],
-        [0.50, 0.00, 0.25],
-        [0.00, 0.50, 0.25],
-        [0.50, 0.50, 0.25],
-        [0.00, 0.00, 0.75],
-        [0.50, 0.00, 0.75],
-        [0.00, 0.50, 0.75],
-        [0.50, 0.50, 0.75],
-    ]
+    points = np.load(cwd / "nacl_222_points.npy")
     lattice = np.eye(3) * 11.2811199999999996
     numbers = [11] * 32 + [17] * 32
     return CellDataset(lattice, points, numbers)
@@ -109,23 +44,14 @@ def nacl_222_structure() -> CellDataset:
 @pytest.fixture(scope="session")
 def nacl_222_dataset() -> DispForceDataset:
     """Return NaCl 2x2x2 dataset."""
-    return read_dataset(cwd / "FORCE_SETS_NaCl.xz")
+    return read_dataset(cwd / "FORCE_SETS_NaCl.xz", natom=64)
 
 
 @pytest.fixture(scope="session")
 def si_111_structure() -> CellDataset:
     """Return Si 1x1x1 supercell structure."""
     lattice = np.eye(3) * 5.43356
-    points = [
-        [0.875, 0.875, 0.875],
-        [0.875, 0.375, 0.375],
-        [0.375, 0.875, 0.375],
-        [0.375, 0.375, 0.875],
-        [0.125, 0.125, 0.125],
-        [0.125, 0.625, 0.625],
-        [0.625, 0.125, 0.625],
-        [0.625, 0.625, 0.125],
-    ]
+    points = np.load(cwd / "si_111_points.npy")
     numbers = [14] * 8
     return CellDataset(lattice, points, numbers)
 
@@ -133,7 +59,7 @@ def si_111_structure() -> CellDataset:
 @pytest.fixture(scope="session")
 def si_111_dataset() -> DispForceDataset:
     """Return Si 1x1x1 dataset."""
-    return read_dataset(cwd / "FORCE_SETS_Si111.xz")
+    return read_dataset(cwd / "FORCE_SETS_Si111.xz", natom=8)
 
 
 @pytest.fixture(scope="session")
@@ -147,80 +73,7 @@ def si_111_Ab(si_111_dataset: DispForceDataset, si_111_structure: CellDataset):
 @pytest.fixture(scope="session")
 def aln_332_structure() -> CellDataset:
     """Return AlN 3x3x2 supercell structure."""
-    points = [
-        [0.11111, 0.22222, 0.00047],
-        [0.44444, 0.22222, 0.00047],
-        [0.77778, 0.22222, 0.00047],
-        [0.11111, 0.55556, 0.00047],
-        [0.44444, 0.55556, 0.00047],
-        [0.77778, 0.55556, 0.00047],
-        [0.11111, 0.88889, 0.00047],
-        [0.44444, 0.88889, 0.00047],
-        [0.77778, 0.88889, 0.00047],
-        [0.11111, 0.22222, 0.50047],
-        [0.44444, 0.22222, 0.50047],
-        [0.77778, 0.22222, 0.50047],
-        [0.11111, 0.55556, 0.50047],
-        [0.44444, 0.55556, 0.50047],
-        [0.77778, 0.55556, 0.50047],
-        [0.11111, 0.88889, 0.50047],
-        [0.44444, 0.88889, 0.50047],
-        [0.77778, 0.88889, 0.50047],
-        [0.22222, 0.11111, 0.25047],
-        [0.55556, 0.11111, 0.25047],
-        [0.88889, 0.11111, 0.25047],
-        [0.22222, 0.44444, 0.25047],
-        [0.55556, 0.44444, 0.25047],
-        [0.88889, 0.44444, 0.25047],
-        [0.22222, 0.77778, 0.25047],
-        [0.55556, 0.77778, 0.25047],
-        [0.88889, 0.77778, 0.25047],
-        [0.22222, 0.11111, 0.75047],
-        [0.55556, 0.11111, 0.75047],
-        [0.88889, 0.11111, 0.75047],
-        [0.22222, 0.44444, 0.75047],
-        [0.55556, 0.44444, 0.75047],
-        [0.88889, 0.44444, 0.75047],
-        [0.22222, 0.77778, 0.75047],
-        [0.55556, 0.77778, 0.75047],
-        [0.88889, 0.77778, 0.75047],
-        [0.11111, 0.22222, 0.30953],
-        [0.44444, 0.22222, 0.30953],
-        [0.77778, 0.22222, 0.30953],
-        [0.11111, 0.55556, 0.30953],
-        [0.44444, 0.55556, 0.30953],
-        [0.77778, 0.55556, 0.30953],
-        [0.11111, 0.88889, 0.30953],
-        [0.44444, 0.88889, 0.30953],
-        [0.77778, 0.88889, 0.30953],
-        [0.11111, 0.22222, 0.80953],
-        [0.44444, 0.22222, 0.80953],
-        [0.77778, 0.22222, 0.80953],
-        [0.11111, 0.55556, 0.80953],
-        [0.44444, 0.55556, 0.80953],
-        [0.77778, 0.55556, 0.80953],
-        [0.11111, 0.88889, 0.80953],
-        [0.44444, 0.88889, 0.80953],
-        [0.77778, 0.88889, 0.80953],
-        [0.22222, 0.11111, 0.05953],
-        [0.55556, 0.11111, 0.05953],
-        [0.88889, 0.11111, 0.05953],
-        [0.22222, 0.44444, 0.05953],
-        [0.55556, 0.44444, 0.05953],
-        [0.88889, 0.44444, 0.05953],
-        [0.22222, 0.77778, 0.05953],
-        [0.55556, 0.77778, 0.05953],
-        [0.88889, 0.77778, 0.05953],
-        [0.22222, 0.11111, 0.55953],
-        [0.55556, 0.11111, 0.55953],
-        [0.88889, 0.11111, 0.55953],
-        [0.22222, 0.44444, 0.55953],
-        [0.55556, 0.44444, 0.55953],
-        [0.88889, 0.44444, 0.55953],
-        [0.22222, 0.77778, 0.55953],
-        [0.55556, 0.77778, 0.55953],
-        [0.88889, 0.77778, 0.55953],
-    ]
+    points = np.load(cwd / "aln_332_points.npy")
     lattice = [
         [9.333, 0.0, 0.0],
         [-4.6665, 8.08261509, 0.0],
@@ -239,10 +92,7 @@ def aln_332_dataset() -> DispForceDataset:
     Return 'DispForceDataset' of AlN is rank deficient data.
 
     """
-    aln_dataset = read_dataset(cwd / "FORCE_SETS_AlN.xz")
-    aln_dataset.displacements = aln_dataset.displacements.reshape(-1, 72, 3)
-    aln_dataset.forces = aln_dataset.forces.reshape(-1, 72, 3)
-    return aln_dataset
+    return read_dataset(cwd / "FORCE_SETS_AlN.xz", natom=72)
 
 
 @pytest.fixture(scope="session")
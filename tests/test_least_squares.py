@@ -0,0 +1,90 @@
+"""Tests of least squares solvers."""
+
+import numpy as np
+import pytest
+
+from symfc_alm.least_squares import (
+    solve_lstsq,
+    solve_normal,
+    solve_normal_mixed,
+    solve_pinv,
+)
+
+
+def test_solve_lstsq(si_111_Ab):
+    """Test solve_lstsq() compared with solve_pinv()."""
+    A, b = si_111_Ab
+    psi = solve_lstsq(A, b)
+    np.testing.assert_allclose(psi, solve_pinv(A, b), rtol=1e-08, atol=1e-10)
+
+
+def test_solve_pinv(si_111_Ab):
+    """Test solve_pinv() compared with np.linalg.pinv()."""
+    A, b = si_111_Ab
+    psi = solve_pinv(A, b)
+    np.testing.assert_allclose(psi, np.linalg.pinv(A) @ b, rtol=1e-08, atol=1e-10)
+
+
+@pytest.mark.big
+def test_solve_lstsq_deficient(aln_332_Ab):
+    """Test solve_lstsq() with rank deficient A compared with np.linalg.pinv()."""
+    A, b = aln_332_Ab
+    psi = solve_lstsq(A, b)
+    np.testing.assert_allclose(psi, np.linalg.pinv(A) @ b, rtol=1e-06, atol=1e-08)
+
+
+def test_solve_normal(si_111_Ab):
+    """Test solve_normal() compared with solve_pinv()."""
+    A, b = si_111_Ab
+    psi = solve_normal(A, b)
+    np.testing.assert_allclose(psi, solve_pinv(A, b), rtol=1e-06, atol=1e-08)
+
+
+def test_solve_normal_fortran_order(si_111_Ab):
+    """Test solve_normal() with Fortran-ordered A."""
+    A, b = si_111_Ab
+    psi = solve_normal(np.asfortranarray(A), b)
+    np.testing.assert_allclose(psi, solve_normal(A, b))
+
+
+def test_solve_normal_mixed(si_111_Ab):
+    """Test solve_normal_mixed() compared with solve_lstsq()."""
+    A, b = si_111_Ab
+    psi = solve_normal_mixed(A, b)
+    np.testing.assert_allclose(psi, solve_lstsq(A, b), rtol=1e-08, atol=1e-10)
+
+
+@pytest.mark.parametrize("cond", [1e1, 1e3])
+def test_solve_normal_mixed_refinement(cond):
+    """Test iterative refinement of solve_normal_mixed() reaches double precision."""
+    A, b = _get_Ab_with_cond(cond)
+    psi = solve_normal_mixed(A, b)
+    psi_ref = solve_lstsq(A, b)
+    assert np.linalg.norm(psi - psi_ref) < 1e-09 * np.linalg.norm(psi_ref)
+
+
+@pytest.mark.parametrize("cond", [1e4, 1e6])
+def test_solve_normal_mixed_fallback(cond):
+    """Test solve_normal_mixed() falls back to solve_normal() for ill-conditioned A."""
+    A, b = _get_Ab_with_cond(cond)
+    psi = solve_normal_mixed(A, b)
+    np.testing.assert_allclose(psi, solve_normal(A, b), rtol=1e-12, atol=1e-14)
+
+
+@pytest.mark.big
+def test_solve_normal_deficient(aln_332_Ab):
+    """Test solve_normal() with rank deficient A compared with np.linalg.pinv()."""
+    A, b = aln_332_Ab
+    psi = solve_normal(A, b)
+    np.testing.assert_allclose(psi, np.linalg.pinv(A) @ b, rtol=1e-06, atol=1e-08)
+
+
+def _get_Ab_with_cond(cond: float, shape: tuple = (3000, 300)):
+    """Return random A with condition number cond and random b."""
+    rng = np.random.default_rng(0)
+    U, _ = np.linalg.qr(rng.standard_normal(shape))
+    V, _ = np.linalg.qr(rng.standard_normal((shape[1], shape[1])))
+    sigma = np.logspace(0, -np.log10(cond), shape[1])
+    A = (U * sigma) @ V.T
+    b = rng.standard_normal(shape[0])
+    return A, b
@@ -1,13 +1,24 @@
 """Tests of symfc-alm API."""
 from __future__ import annotations
 
+import lzma
+import shutil
+import subprocess
 from pathlib import Path
 
 import h5py
 import numpy as np
 import pytest
 
-from symfc_alm import CellDataset, DispForceDataset, LinearModel, SymfcAlm
+from symfc_alm import (
+    CellDataset,
+    DispForceDataset,
+    LinearModel,
+    LinearSolver,
+    SymfcAlm,
+    read_dataset,
+)
+from symfc_alm.symfc_alm import _read_xz
 
 cwd = Path(__file__).parent
 
@@ -24,6 +35,86 @@ def test_df_dataset(nacl_222_dataset: DispForceDataset):
     np.testing.assert_allclose(f[-1, -1], [0.06387808, -0.01690191, 0.04503784])
 
 
+def test_df_dataset_reassign(nacl_222_dataset: DispForceDataset):
+    """Test reassigning displacements and forces one after the other."""
+    d = nacl_222_dataset.displacements
+    f = nacl_222_dataset.forces
+    dataset = DispForceDataset(d, f)
+    dataset.displacements = dataset.displacements[:50]
+    dataset.forces = dataset.forces[:50]
+    np.testing.assert_array_equal(dataset.displacements, d[:50])
+    np.testing.assert_array_equal(dataset.forces, f[:50])
+    dataset.displacements = dataset.displacements.reshape(-1, 32, 3)
+    dataset.forces = dataset.forces.reshape(-1, 32, 3)
+    np.testing.assert_array_equal(dataset.displacements.shape, (100, 32, 3))
+    np.testing.assert_array_equal(dataset.forces, f[:50].reshape(-1, 32, 3))
+
+
+def test_df_dataset_data(nacl_222_dataset: DispForceDataset):
+    """Test DispForceDataset(data=data) does not copy C-contiguous data."""
+    data = np.concatenate(
+        (nacl_222_dataset.displacements, nacl_222_dataset.forces), axis=-1
+    )
+    dataset = DispForceDataset(data=data)
+    assert np.shares_memory(dataset.displacements, data)
+    assert np.shares_memory(dataset.forces, data)
+    np.testing.assert_array_equal(dataset.forces, nacl_222_dataset.forces)
+    with pytest.raises(RuntimeError):
+        DispForceDataset(nacl_222_dataset.displacements, data=data)
+
+
+def test_df_dataset_si(si_111_dataset: DispForceDataset):
+    """Test reading displacements-forces dataset with natom."""
+    np.testing.assert_array_equal(si_111_dataset.displacements.shape, (1000, 8, 3))
+    np.testing.assert_array_equal(si_111_dataset.forces.shape, (1000, 8, 3))
+
+
+def test_read_dataset_without_natom():
+    """Test read_dataset() without natom is deprecated and uses natom=64."""
+    with pytest.deprecated_call():
+        dataset = read_dataset(cwd / "FORCE_SETS_NaCl.xz")
+    np.testing.assert_array_equal(dataset.displacements.shape, (200, 64, 3))
+
+
+def test_read_dataset_inconsistent_natom():
+    """Test read_dataset() with natom inconsistent with dataset."""
+    with pytest.raises(RuntimeError):
+        read_dataset(cwd / "FORCE_SETS_NaCl.xz", natom=7)
+
+
+@pytest.mark.parametrize("xz", [None, shutil.which("false")])
+def test_read_xz_fallback(monkeypatch: pytest.MonkeyPatch, xz):
+    """Test _read_xz() with lzma module when xz command is missing or fails."""
+    content = _read_xz(cwd / "FORCE_SETS_NaCl.xz")
+    monkeypatch.setattr(shutil, "which", lambda _: xz)
+    assert _read_xz(cwd / "FORCE_SETS_NaCl.xz") == content
+
+
+def test_read_xz_multi_block(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    """Test _read_xz() with xz file split into blocks.
+
+    Such a file is decompressed by xz command using multiple threads. It is made
+    by xz command since lzma module can not split a stream into blocks.
+
+    """
+    xz = shutil.which("xz")
+    if xz is None:
+        pytest.skip("xz command is unavailable.")
+    with lzma.open(cwd / "FORCE_SETS_NaCl.xz", "rb") as f:
+        content = f.read()
+    fp = tmp_path / "FORCE_SETS.xz"
+    with open(fp, "wb") as w:
+        subprocess.run(
+            [xz, "--block-size=256KiB", "-T0", "-c"],
+            input=content,
+            stdout=w,
+            check=True,
+        )
+    assert _read_xz(fp) == content
+    monkeypatch.setattr(shutil, "which", lambda _: None)
+    assert _read_xz(fp) == content
+
+
 def test_cell_dataset(nacl_222_structure: CellDataset):
     """Test cell dataset."""
     cell = nacl_222_structure
@@ -61,6 +152,36 @@ def test_run_fc2_nacl(
     np.testing.assert_allclose(sfa.force_constants[0], fc2)
 
 
+@pytest.mark.parametrize(
+    "solver",
+    [
+        LinearSolver.Cholesky,
+        LinearSolver.CholeskyMixedPrecision,
+        LinearSolver.PseudoInverse,
+    ],
+)
+def test_run_fc2_nacl_solver(
+    nacl_222_dataset: DispForceDataset,
+    nacl_222_structure: CellDataset,
+    solver: LinearSolver,
+):
+    """Test SymfcAlm.run() with NaCl fc2 using different least squares solvers.
+
+    Note1
+    -----
+    See docstring of test_run_fc2_nacl().
+
+    """
+    with SymfcAlm(nacl_222_dataset, nacl_222_structure, log_level=0) as sfa:
+        sfa.run(maxorder=1, solver=solver)
+    assert sfa._alm is None
+
+    with h5py.File(cwd / "force_constants_NaCl.hdf5") as f:
+        fc2 = f["force_constants"][:]
+
+    np.testing.assert_allclose(sfa.force_constants[0], fc2, rtol=1e-05, atol=1e-08)
+
+
 def test_run_fc2_nacl_ridge(
     nacl_222_dataset: DispForceDataset, nacl_222_structure: CellDataset
 ):
@@ -123,6 +244,31 @@ def test_run_fc2_fc3_si(
     np.testing.assert_allclose(sfa.force_constants[1], fc3)
 
 
+def test_run_fc2_fc3_si_sparse(
+    si_111_dataset: DispForceDataset, si_111_structure: CellDataset
+):
+    """Test SymfcAlm.run(dense=False) with Si fc2 and fc3 simultaneously.
+
+    Note1
+    -----
+    See docstring of test_run_fc2_fc3_si().
+
+    """
+    with SymfcAlm(si_111_dataset, si_111_structure, log_level=0) as sfa:
+        sfa.run(maxorder=2, dense=False)
+    assert sfa._alm is None
+    with h5py.File(cwd / "fc2_Si111.hdf5") as f:
+        fc2 = f["force_constants"][:]
+    with h5py.File(cwd / "fc3_Si111.hdf5") as f:
+        fc3 = f["fc3"][:]
+
+    for (values, indices), fc_ref in zip(sfa.force_constants, (fc2, fc3)):
+        assert indices.shape == (len(values), fc_ref.ndim)
+        fc = np.zeros_like(fc_ref)
+        fc[tuple(indices.T)] = values
+        np.testing.assert_allclose(fc, fc_ref)
+
+
 def test_run_fc2_fc3_si_ridge(
     si_111_dataset: DispForceDataset, si_111_structure: CellDataset
 ):
@@ -275,6 +421,18 @@ def test_get_matrix_elements_fc2_fc3_si(
     assert A.shape[0] == b.shape[0]
 
 
+def test_get_matrix_elements_inconsistent_dataset(
+    si_111_dataset: DispForceDataset, si_111_structure: CellDataset
+):
+    """Test SymfcAlm.get_matrix_elements() with inconsistent dataset."""
+    dataset = DispForceDataset(si_111_dataset.displacements, si_111_dataset.forces)
+    dataset.displacements = dataset.displacements[:10]
+    with SymfcAlm(dataset, si_111_structure, log_level=0) as sfa:
+        with pytest.raises(RuntimeError):
+            sfa.get_matrix_elements(maxorder=1)
+    assert sfa._alm is None
+
+
 def test_get_matrix_elements_fc2_nacl(
     nacl_222_dataset: DispForceDataset, nacl_222_structure: CellDataset
 ):